@@ -1,10 +1,84 @@
 """Base 2FA handler interface."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 from playwright.async_api import Page
 from src.models import LoginRequest
 
+# 2FA code inputs shared by every handler, most specific (and most common) first;
+# the broad name/id substring matches go last
+TWOFA_SELECTORS: Tuple[str, ...] = (
+    'input[autocomplete="one-time-code"]',
+    'input[type="tel"][maxlength="6"]',
+    'input[placeholder*="code" i]',
+    'input[placeholder*="verification" i]',
+    'input[placeholder*="2fa" i]',
+    'input[placeholder*="two-factor" i]',
+    'input[data-qa*="code"]',
+    'input[data-qa*="verification"]',
+    'input[name*="code"]',
+    'input[name*="verification"]',
+    'input[id*="code"]',
+    'input[id*="verification"]',
+)
+# Any visible 2FA input as one CSS selector list (matches in document order)
+TWOFA_INPUT_SELECTOR = ", ".join(TWOFA_SELECTORS) + " >> visible=true"
+
+TWOFA_SUBMIT_SELECTORS: Tuple[str, ...] = (
+    'button[type="submit"]',
+    'button:has-text("Verify")',
+    'button:has-text("Submit")',
+    'button:has-text("Continue")',
+    'button:has-text("Confirm")',
+    'button[data-qa*="submit"]',
+    'button[data-qa*="verify"]',
+    'button[data-qa*="confirm"]',
+)
+# Any visible submit button as one selector list (matches in document order)
+TWOFA_SUBMIT_SELECTOR = ", ".join(TWOFA_SUBMIT_SELECTORS) + " >> visible=true"
+
+TWOFA_TEXT_INDICATORS: Tuple[str, ...] = (
+    "Enter verification code",
+    "Two-factor authentication",
+    "Enter the 6-digit code",
+    "Authentication required",
+    "Enter your authenticator code",
+    "Enter your security code",
+)
+
+# Runs every 2FA probe inside the page: the first visible input selector wins,
+# otherwise the first text indicator found in the rendered text (case-insensitive)
+_PROBE_2FA_JS = """([selectors, texts]) => {
+    const visible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+    for (const selector of selectors) {
+        if (Array.from(document.querySelectorAll(selector)).some(visible)) {
+            return {selector: selector, text: null};
+        }
+    }
+    const rendered = document.body ? document.body.innerText.toLowerCase() : '';
+    const text = texts.find(t => rendered.includes(t.toLowerCase()));
+    return {selector: null, text: text || null};
+}"""
+_PROBE_2FA_ARGS = [list(TWOFA_SELECTORS), list(TWOFA_TEXT_INDICATORS)]
+
+
+def adaptive_delays(total: float, first: float = 0.25, cap: float = 5.0) -> Iterator[float]:
+    """Yield poll delays summing to total seconds: each delay is used twice, then doubled up to cap.
+
+    Early polls catch a quick 2FA entry within a fraction of a second while an
+    abandoned prompt costs ~30 probes over two minutes instead of one per second.
+    """
+    delay = first
+    remaining = total
+    while remaining > 0:
+        for _ in range(2):
+            step = min(delay, remaining)
+            yield step
+            remaining -= step
+            if remaining <= 0:
+                return
+        delay = min(delay * 2, cap)
+
 
 class TwoFAHandler(ABC):
     """Abstract base class for 2FA handling implementations."""
@@ -23,3 +97,20 @@ class TwoFAHandler(ABC):
     def get_priority(self) -> int:
         """Get handler priority (higher = preferred)."""
         pass
+
+    @staticmethod
+    async def _probe_2fa(page: Page) -> Dict[str, Optional[str]]:
+        """Probe 2FA selectors and text indicators in one page.evaluate.
+
+        Returns {"selector": ..., "text": ...} with the matching selector or
+        text set, both None when no 2FA prompt is visible.
+        """
+        return await page.evaluate(_PROBE_2FA_JS, _PROBE_2FA_ARGS)
+
+    async def _still_present(self, page: Page) -> bool:
+        """Check whether a 2FA prompt is still showing, e.g. after a code was submitted."""
+        try:
+            match = await self._probe_2fa(page)
+        except Exception:
+            return False
+        return bool(match["selector"] or match["text"])
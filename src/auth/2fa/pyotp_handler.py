@@ -2,16 +2,23 @@
 
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Optional
-from playwright.async_api import Page
+from playwright.async_api import ElementHandle, Page
 import pyotp
 
-from .base import TwoFAHandler
+from .base import TwoFAHandler, TWOFA_INPUT_SELECTOR, TWOFA_SUBMIT_SELECTOR
 from src.models import LoginRequest
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _get_totp(secret: str) -> pyotp.TOTP:
+    """Return a TOTP generator for secret, reused across retries with the same secret."""
+    return pyotp.TOTP(secret)
+
+
 class PyOTPHandler(TwoFAHandler):
     """2FA handler using PyOTP for OTP generation."""
 
@@ -21,53 +28,18 @@ class PyOTPHandler(TwoFAHandler):
     async def can_handle(self, page: Page) -> bool:
         """Check if 2FA is present and we can handle it."""
         try:
-            twofa_selectors = [
-                'input[placeholder*="code" i]',
-                'input[placeholder*="verification" i]',
-                'input[placeholder*="2fa" i]',
-                'input[placeholder*="two-factor" i]',
-                'input[name*="code"]',
-                'input[name*="verification"]',
-                'input[id*="code"]',
-                'input[id*="verification"]',
-                'input[data-qa*="code"]',
-                'input[data-qa*="verification"]',
-                'input[type="tel"][maxlength="6"]',
-                'input[autocomplete="one-time-code"]',
-            ]
-
-            for selector in twofa_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        logger.info(f"2FA input detected with selector: {selector}")
-                        return True
-                except Exception:
-                    continue
-
-            # Check for 2FA text indicators
-            text_indicators = [
-                "Enter verification code",
-                "Two-factor authentication",
-                "Enter the 6-digit code",
-                "Authentication required",
-                "Enter your authenticator code",
-                "Enter your security code"
-            ]
-
-            for text in text_indicators:
-                try:
-                    element = page.get_by_text(text)
-                    if await element.is_visible():
-                        logger.info(f"2FA text detected: {text}")
-                        return True
-                except Exception:
-                    continue
+            match = await self._probe_2fa(page)
+            if match["selector"]:
+                logger.info("2FA input detected with selector: %s", match["selector"])
+                return True
+            if match["text"]:
+                logger.info("2FA text detected: %s", match["text"])
+                return True
 
             return False
 
         except Exception as e:
-            logger.error(f"Error checking for 2FA: {e}")
+            logger.error("Error checking for 2FA: %s", e)
             return False
 
     async def handle_2fa(self, page: Page, request: LoginRequest) -> bool:
@@ -79,18 +51,19 @@ class PyOTPHandler(TwoFAHandler):
         logger.info("2FA detected, attempting to generate OTP...")
 
         # Check if we have a TOTP secret in the request
-        if not hasattr(request, 'totp_secret') or not request.totp_secret:
+        if not request.totp_secret:
             logger.warning("No TOTP secret provided in request")
             return False
 
         try:
-            # Generate TOTP code
-            totp = pyotp.TOTP(request.totp_secret)
-            otp_code = totp.now()
-            logger.info(f"Generated OTP code: {otp_code}")
+            # Generate TOTP code off the event loop while locating the 2FA input field
+            totp = _get_totp(request.totp_secret)
+            otp_code, twofa_input = await asyncio.gather(
+                asyncio.to_thread(totp.now),
+                self._find_2fa_input(page),
+            )
+            logger.debug("Generated OTP code: %s", otp_code)
 
-            # Find 2FA input field
-            twofa_input = await self._find_2fa_input(page)
             if not twofa_input:
                 logger.error("Could not find 2FA input field")
                 return False
@@ -107,7 +80,7 @@ class PyOTPHandler(TwoFAHandler):
             await page.wait_for_timeout(3000)
 
             # Check if 2FA was successful
-            if not await self.can_handle(page):
+            if not await self._still_present(page):
                 logger.info("2FA completed successfully")
                 return True
             else:
@@ -115,57 +88,28 @@ class PyOTPHandler(TwoFAHandler):
                 return False
 
         except Exception as e:
-            logger.error(f"2FA handling failed: {e}")
+            logger.error("2FA handling failed: %s", e)
             return False
 
-    async def _find_2fa_input(self, page: Page) -> Optional[Page]:
+    async def _find_2fa_input(self, page: Page) -> Optional[ElementHandle]:
         """Find the 2FA input field."""
-        selectors = [
-            'input[placeholder*="code" i]',
-            'input[placeholder*="verification" i]',
-            'input[placeholder*="2fa" i]',
-            'input[placeholder*="two-factor" i]',
-            'input[name*="code"]',
-            'input[name*="verification"]',
-            'input[id*="code"]',
-            'input[id*="verification"]',
-            'input[data-qa*="code"]',
-            'input[data-qa*="verification"]',
-            'input[type="tel"][maxlength="6"]',
-            'input[autocomplete="one-time-code"]',
-        ]
-
-        for selector in selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    return element
-            except Exception:
-                continue
-
-        return None
+        try:
+            # One in-browser wait over the whole selector list; the short timeout
+            # covers an input that is still rendering
+            return await page.wait_for_selector(TWOFA_INPUT_SELECTOR, state="visible", timeout=100)
+        except Exception:
+            return None
 
     async def _submit_2fa_form(self, page: Page) -> None:
         """Submit the 2FA form."""
-        submit_selectors = [
-            'button[type="submit"]',
-            'button:has-text("Verify")',
-            'button:has-text("Submit")',
-            'button:has-text("Continue")',
-            'button:has-text("Confirm")',
-            'button[data-qa*="submit"]',
-            'button[data-qa*="verify"]',
-            'button[data-qa*="confirm"]',
-        ]
-
-        for selector in submit_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    await element.click()
-                    return
-            except Exception:
-                continue
+        # The union is resolved in the browser, so this is one lookup instead of eight
+        submit_button = page.locator(TWOFA_SUBMIT_SELECTOR).first
+        try:
+            if await submit_button.is_visible():
+                await submit_button.click()
+                return
+        except Exception:
+            pass
 
         # Fallback: press Enter on the input field
         try:
@@ -1,14 +1,58 @@
 """Base classes for authentication strategies."""
 
 import logging
+import re
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional
 from enum import Enum
+from urllib.parse import urlparse
 from playwright.async_api import Page
 from src.models import LoginRequest, SessionCookie, AuthProvider, OAuthTokens
+from src.auth.selector_helper import find_first_visible
 
 logger = logging.getLogger(__name__)
 
+# Common login error indicators, evaluated as a single selector; :text() is the
+# same case-insensitive substring match as get_by_text()
+_ERROR_INDICATOR_SELECTOR = (
+    ':is(:text("Invalid credentials"), :text("Login failed"), '
+    ':text("Incorrect email or password"), .error, .alert-error) >> visible=true'
+)
+
+# Common login form fields and buttons, in priority order
+_EMAIL_SELECTORS = (
+    'input[type="email"]',
+    'input[name="email"]',
+    'input[name="username"]',
+    'input[name="login"]',
+)
+_PASSWORD_SELECTORS = (
+    'input[type="password"]',
+    'input[name="password"]',
+)
+_SUBMIT_SELECTORS = (
+    'button[type="submit"]',
+    'input[type="submit"]',
+    'button:has-text("Sign In")',
+    'button:has-text("Login")',
+    'button:has-text("Continue")',
+)
+
+# Cookie names that look like session cookies
+_SESSION_COOKIE_NAME_RE = re.compile(r"session|auth|token|sid", re.IGNORECASE)
+
+
+def _to_session_cookie(cookie: dict) -> SessionCookie:
+    """Build a SessionCookie from a Playwright cookie; its fields are already normalized."""
+    return SessionCookie.model_construct(
+        name=cookie["name"],
+        value=cookie["value"],
+        domain=cookie["domain"],
+        path=cookie.get("path", "/"),
+        secure=cookie.get("secure", False),
+        http_only=cookie.get("httpOnly", False),
+    )
+
 
 class AuthMethod(str, Enum):
     """Authentication method enumeration."""
@@ -62,27 +106,12 @@ class AuthStrategy(ABC):
 
     async def is_success(self, page: Page) -> bool:
         """Check if login was successful. Override for provider-specific logic."""
-        # Simple default: check for common error indicators
-        error_selectors = [
-            "text=Invalid credentials",
-            "text=Login failed", 
-            "text=Incorrect email or password",
-            ".error",
-            ".alert-error"
-        ]
-
-        for selector in error_selectors:
-            try:
-                if selector.startswith("text="):
-                    element = page.get_by_text(selector[5:])
-                    if await element.is_visible():
-                        return False
-                else:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        return False
-            except Exception:
-                continue
+        # Simple default: check for common error indicators in one composite query
+        try:
+            if await page.locator(_ERROR_INDICATOR_SELECTOR).first.is_visible():
+                return False
+        except Exception as e:
+            logger.debug("Error indicator check failed: %s", e)
 
         # If no errors found, assume success
         return True
@@ -91,39 +120,29 @@ class AuthStrategy(ABC):
         """Extract session cookies. Override for provider-specific filtering."""
         browser_cookies = await page.context.cookies()
         
-        session_cookies = []
-        for cookie in browser_cookies:
-            # Include cookies that look like session cookies
-            if any(keyword in cookie["name"].lower() for keyword in ["session", "auth", "token", "sid"]):
-                session_cookies.append(
-                    SessionCookie(
-                        name=cookie["name"],
-                        value=cookie["value"],
-                        domain=cookie["domain"],
-                        path=cookie.get("path", "/"),
-                        secure=cookie.get("secure", False),
-                        http_only=cookie.get("httpOnly", False),
-                    )
-                )
+        # Include cookies that look like session cookies
+        session_cookies = [
+            _to_session_cookie(cookie)
+            for cookie in browser_cookies
+            if _SESSION_COOKIE_NAME_RE.search(cookie["name"])
+        ]
 
         # If no session cookies found, include all cookies from current domain
         if not session_cookies:
-            current_domain = page.url.split("//")[1].split("/")[0]
-            for cookie in browser_cookies:
-                if current_domain in cookie["domain"]:
-                    session_cookies.append(
-                        SessionCookie(
-                            name=cookie["name"],
-                            value=cookie["value"],
-                            domain=cookie["domain"],
-                            path=cookie.get("path", "/"),
-                            secure=cookie.get("secure", False),
-                            http_only=cookie.get("httpOnly", False),
-                        )
-                    )
+            current_domain = urlparse(page.url).netloc
+            session_cookies = [
+                _to_session_cookie(cookie)
+                for cookie in browser_cookies
+                if current_domain in cookie["domain"]
+            ]
 
+        logger.info("✅ Extracted %d/%d cookies", len(session_cookies), len(browser_cookies))
         return session_cookies
 
+    def get_storage_state_path(self, request: LoginRequest) -> Optional[str]:
+        """Get a saved browser storage state to replay for this request. Override to enable reuse."""
+        return None
+
     async def handle_captcha(self, page: Page) -> bool:
         """Handle CAPTCHA if present. Override for provider-specific logic."""
         # Simple default: assume no CAPTCHA or it's handled automatically
@@ -197,56 +216,22 @@ class BaseWebAuthStrategy(AuthStrategy):
     async def fill_credentials(self, page: Page, request: LoginRequest) -> None:
         """Fill email and password with common selectors."""
         # Fill email
-        email_selectors = [
-            'input[type="email"]',
-            'input[name="email"]',
-            'input[name="username"]',
-            'input[name="login"]',
-        ]
-
-        for selector in email_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    await page.fill(selector, request.email)
-                    break
-            except Exception:
-                continue
+        email_match = await find_first_visible(page, _EMAIL_SELECTORS)
+        if email_match:
+            await email_match[1].fill(request.email)
 
         # Fill password if provided
         if request.password:
-            password_selectors = [
-                'input[type="password"]',
-                'input[name="password"]',
-            ]
-
-            for selector in password_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        await page.fill(selector, request.password)
-                        break
-                except Exception:
-                    continue
+            password_match = await find_first_visible(page, _PASSWORD_SELECTORS)
+            if password_match:
+                await password_match[1].fill(request.password)
 
     async def submit_form(self, page: Page) -> None:
         """Submit form with common selectors."""
-        submit_selectors = [
-            'button[type="submit"]',
-            'input[type="submit"]',
-            'button:has-text("Sign In")',
-            'button:has-text("Login")',
-            'button:has-text("Continue")',
-        ]
-
-        for selector in submit_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    await element.click()
-                    return
-            except Exception:
-                continue
+        submit_match = await find_first_visible(page, _SUBMIT_SELECTORS)
+        if submit_match:
+            await submit_match[1].click()
+            return
 
         # Fallback: press Enter on password field
         try:
@@ -2,7 +2,6 @@
 
 from abc import ABC, abstractmethod
 from playwright.async_api import Page
-from typing import Optional
 
 
 class CaptchaSolver(ABC):
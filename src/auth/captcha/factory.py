@@ -1,7 +1,7 @@
 """Factory for creating CAPTCHA solvers with fallback chain."""
 
 from enum import Enum
-from typing import List, Type, Dict, Optional
+from typing import List, Optional, Type, Dict
 from .base import CaptchaSolver
 from .solvers import (
     BrowserbaseCaptchaSolver,
@@ -27,6 +27,20 @@ class CaptchaSolverFactory:
         CaptchaSolverType.NOOP: NoopCaptchaSolver,
     }
 
+    # Solvers hold no per-solve state, so one instance per type is shared
+    _instances: Dict[CaptchaSolverType, CaptchaSolver] = {}
+
+    @classmethod
+    def create_solver(cls, solver_type: CaptchaSolverType) -> Optional[CaptchaSolver]:
+        """Get the shared solver instance for solver_type, or None if unknown."""
+        solver = cls._instances.get(solver_type)
+        if solver is None:
+            solver_class = cls._solvers.get(solver_type)
+            if solver_class is None:
+                return None
+            solver = cls._instances.setdefault(solver_type, solver_class())
+        return solver
+
     @classmethod
     def create_solver_chain(
         cls, preferred_solvers: List[CaptchaSolverType]
@@ -34,7 +48,7 @@ class CaptchaSolverFactory:
         """Create a chain of CAPTCHA solvers with fallback."""
         solvers = []
         for solver_type in preferred_solvers:
-            solver_class = cls._solvers.get(solver_type)
-            if solver_class:
-                solvers.append(solver_class())
+            solver = cls.create_solver(solver_type)
+            if solver:
+                solvers.append(solver)
         return sorted(solvers, key=lambda s: s.get_priority(), reverse=True)
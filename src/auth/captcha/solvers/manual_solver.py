@@ -7,6 +7,21 @@ from ..base import CaptchaSolver
 
 logger = logging.getLogger(__name__)
 
+# Common CAPTCHA widgets, matched only when visible
+_CAPTCHA_SELECTOR = ":is(" + ", ".join((
+    'iframe[src*="recaptcha"]',
+    '.g-recaptcha',
+    '.h-captcha',
+    '[data-sitekey]',
+    'div[class*="captcha"]',
+    '[data-callback*="captcha"]',
+    'div[id*="captcha"]',
+    '.captcha',
+    '[aria-label*="captcha"]',
+    'iframe[src*="hcaptcha"]',
+    'div[class*="cf-turnstile"]',
+)) + ") >> visible=true"
+
 
 class ManualCaptchaSolver(CaptchaSolver):
     """CAPTCHA solver that waits for manual intervention."""
@@ -17,27 +32,9 @@ class ManualCaptchaSolver(CaptchaSolver):
     async def can_handle(self, page: Page) -> bool:
         """Check if CAPTCHA is present."""
         try:
-            captcha_selectors = [
-                'iframe[src*="recaptcha"]',
-                '.g-recaptcha',
-                '.h-captcha',
-                '[data-sitekey]',
-                'div[class*="captcha"]',
-                '[data-callback*="captcha"]',
-                'div[id*="captcha"]',
-                '.captcha',
-                '[aria-label*="captcha"]',
-                'iframe[src*="hcaptcha"]',
-                'div[class*="cf-turnstile"]',
-            ]
-
-            for selector in captcha_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        return True
-                except Exception:
-                    continue
+            # One visibility-filtered query instead of query_selector + is_visible per selector
+            if await page.query_selector(_CAPTCHA_SELECTOR):
+                return True
 
             # Check for "I'm not a robot" text
             try:
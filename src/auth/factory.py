@@ -37,7 +37,7 @@ class AuthStrategyFactory:
         if method and not strategy.supports_method(method):
             raise ValueError(f"Provider {provider} does not support authentication method: {method}")
         
-        logger.info(f"Created {strategy.__class__.__name__} for {provider}")
+        logger.info("Created %s for %s", strategy.__class__.__name__, provider)
         return strategy
 
     @classmethod
@@ -72,7 +72,7 @@ class AuthStrategyFactory:
     def register_strategy(cls, provider: AuthProvider, strategy_class: Type[AuthStrategy]) -> None:
         """Register a strategy for a provider."""
         cls._strategies[provider] = strategy_class
-        logger.info(f"Registered strategy for {provider}: {strategy_class.__name__}")
+        logger.info("Registered strategy for %s: %s", provider, strategy_class.__name__)
 
     @classmethod
     def get_strategy_info(cls, provider: AuthProvider) -> Dict[str, any]:
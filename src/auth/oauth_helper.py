@@ -1,12 +1,17 @@
 """OAuth helper functions."""
 
 import logging
+import re
 from typing import Optional, Dict
 import httpx
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import unquote_plus
 
 logger = logging.getLogger(__name__)
 
+# Single-pass matchers for OAuth callback parameters (query string or fragment)
+_CODE_RE = re.compile(r"[?&#]code=([^&#]+)")
+_ERROR_RE = re.compile(r"[?&#]error=([^&#]+)")
+
 
 async def exchange_code_for_token(
     token_url: str,
@@ -27,7 +32,7 @@ async def exchange_code_for_token(
     if extra:
         data.update(extra)
     
-    logger.info(f"Exchanging code for token at {token_url}")
+    logger.info("Exchanging code for token at %s", token_url)
     
     async with httpx.AsyncClient(timeout=30) as client:
         resp = await client.post(token_url, data=data, headers={"Accept": "application/json"})
@@ -62,7 +67,7 @@ async def exchange_slack_code_for_token(
         
         if not result.get("ok"):
             error = result.get("error", "Unknown error")
-            logger.error(f"Slack token exchange failed: {error}")
+            logger.error("Slack token exchange failed: %s", error)
             raise Exception(f"Slack token exchange failed: {error}")
         
         logger.info("Slack token exchange successful")
@@ -71,13 +76,11 @@ async def exchange_slack_code_for_token(
 
 def extract_code_from_url(url: str) -> Optional[str]:
     """Extract authorization code from callback URL."""
-    qs = parse_qs(urlparse(url).query)
-    codes = qs.get("code")
-    return codes[0] if codes else None
+    match = _CODE_RE.search(url)
+    return unquote_plus(match.group(1)) if match else None
 
 
 def extract_error_from_url(url: str) -> Optional[str]:
     """Extract error from callback URL."""
-    qs = parse_qs(urlparse(url).query)
-    errors = qs.get("error")
-    return errors[0] if errors else None
+    match = _ERROR_RE.search(url)
+    return unquote_plus(match.group(1)) if match else None
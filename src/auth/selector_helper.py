@@ -0,0 +1,27 @@
+"""Selector probing helper functions."""
+
+import asyncio
+from typing import Optional, Sequence, Tuple
+from playwright.async_api import Locator, Page
+
+
+async def find_first_visible(page: Page, selectors: Sequence[str]) -> Optional[Tuple[str, Locator]]:
+    """Probe selectors concurrently and return the highest-priority visible match.
+
+    All selectors are counted in one concurrent batch, and only the hits are
+    checked for visibility, so a stage costs two round-trips instead of one
+    per selector. Returns (selector, locator) or None when nothing is visible.
+    """
+    locators = [page.locator(selector).first for selector in selectors]
+    counts = await asyncio.gather(*(locator.count() for locator in locators), return_exceptions=True)
+
+    hits = [i for i, count in enumerate(counts) if not isinstance(count, BaseException) and count]
+    if not hits:
+        return None
+
+    visible = await asyncio.gather(*(locators[i].is_visible() for i in hits), return_exceptions=True)
+    for i, is_visible in zip(hits, visible):
+        if is_visible is True:
+            return selectors[i], locators[i]
+
+    return None
@@ -24,7 +24,7 @@ class BrowserProviderFactory:
 
     @classmethod
     def create_provider(cls, provider_type: BrowserProviderType) -> BrowserProvider:
-        """Create a browser provider instance."""
+        """Create a browser provider instance; the caller owns and closes it."""
         provider_class = cls._providers.get(provider_type)
         if not provider_class:
             raise ValueError(f"Unsupported browser provider: {provider_type}")
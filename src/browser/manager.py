@@ -1,29 +1,37 @@
 """Enhanced browser manager using factory pattern."""
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional, Dict, Any
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional, Dict, Any, List
 from playwright.async_api import Page
 
+from .base import BrowserProvider
 from .factory import BrowserProviderFactory, BrowserProviderType
 from ..config import settings
-from ..storage import SessionStorage, MockSessionStorage, DynamoDBSessionStorage
+from ..storage.base import SessionRecord
+from ..storage.factory import get_session_storage
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Type of the provider serving the current task's get_page
+_current_provider_type: ContextVar[Optional[BrowserProviderType]] = ContextVar(
+    "current_provider_type", default=None
+)
+
+
 
 class BrowserManager:
     """Enhanced browser manager with support for multiple providers."""
 
     def __init__(self):
         self.factory = BrowserProviderFactory()
-        self._current_provider = None
+        # Providers owned by this manager: created on first use, reused across calls
+        # so tracked sessions outlive a single get_page, and closed in aclose
+        self._providers: Dict[BrowserProviderType, BrowserProvider] = {}
         
-        # Initialize session storage
-        if settings.storage_type == "dynamodb":
-            self.session_storage = DynamoDBSessionStorage()
-        else:
-            self.session_storage = MockSessionStorage()
+        # Shared with the providers so one storage client serves the whole process
+        self.session_storage = get_session_storage()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -31,12 +39,27 @@ class BrowserManager:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        # Cleanup any resources if needed
-        if self._current_provider:
-            # Currently no cleanup needed for providers
-            pass
+        await self.aclose()
         return False
 
+    async def aclose(self) -> None:
+        """Release long-lived provider resources (drivers, executors) if they hold any."""
+        for provider in self._providers.values():
+            aclose = getattr(provider, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception as e:
+                    logger.warning("Failed to close provider %s: %s", provider.__class__.__name__, e)
+        self._providers.clear()
+
+    def _get_provider(self, provider_type: BrowserProviderType) -> BrowserProvider:
+        """Get the provider for provider_type, creating it on first use."""
+        provider = self._providers.get(provider_type)
+        if provider is None:
+            provider = self._providers[provider_type] = self.factory.create_provider(provider_type)
+        return provider
+
     @asynccontextmanager
     async def get_page(
         self,
@@ -67,55 +90,65 @@ class BrowserManager:
 
         logger.info("Creating browser session with provider: %s", provider_type.value)
 
+        # Scoped to the calling task, so concurrent get_page calls don't overwrite each other
+        token = _current_provider_type.set(None)
         try:
-            # Create provider instance
-            provider = self.factory.create_provider(provider_type)
-            self._current_provider = provider
-
-            # Get page from provider
-            async with provider.get_page(
-                headless=headless,
-                captcha_solving=captcha_solving,
-                proxy_config=proxy_config,
-                browser_type=browser_type,
-                **kwargs,
-            ) as page:
-                logger.info("Browser page created successfully")
-                yield page
-
-        except Exception as e:
-            logger.error("Failed to create browser page: %s", e)
-
-            # Fallback to local provider if Browserbase fails
-            if provider_type == BrowserProviderType.BROWSERBASE:
-                logger.info("Falling back to local browser provider...")
+            async with AsyncExitStack() as stack:
                 try:
-                    local_provider = self.factory.create_provider(
-                        BrowserProviderType.LOCAL
+                    # Create provider instance
+                    provider = self._get_provider(provider_type)
+                    _current_provider_type.set(provider_type)
+
+                    # Get page from provider; the Browserbase provider bounds its own connect
+                    # so the fallback below starts within a bounded time
+                    page = await stack.enter_async_context(
+                        provider.get_page(
+                            headless=headless,
+                            captcha_solving=captcha_solving,
+                            proxy_config=proxy_config,
+                            browser_type=browser_type,
+                            **kwargs,
+                        )
                     )
-                    self._current_provider = local_provider
-
-                    async with local_provider.get_page(
-                        headless=headless,
-                        captcha_solving=False,  # Local doesn't support auto-solving
-                        proxy_config=proxy_config,
-                        browser_type=browser_type,
-                        **kwargs,
-                    ) as page:
+                    logger.info("Browser page created successfully")
+
+                except Exception as e:
+                    logger.error("Failed to create browser page: %s", e)
+                    # Formatted by logging only when DEBUG is enabled
+                    logger.debug("Full traceback:", exc_info=True)
+
+                    # Fallback to local provider if Browserbase fails
+                    if provider_type != BrowserProviderType.BROWSERBASE:
+                        raise
+                    logger.info("Falling back to local browser provider...")
+                    try:
+                        local_provider = self._get_provider(BrowserProviderType.LOCAL)
+                        _current_provider_type.set(BrowserProviderType.LOCAL)
+
+                        page = await stack.enter_async_context(
+                            local_provider.get_page(
+                                headless=headless,
+                                captcha_solving=False,  # Local doesn't support auto-solving
+                                proxy_config=proxy_config,
+                                browser_type=browser_type,
+                                **kwargs,
+                            )
+                        )
                         logger.info("Fallback browser page created successfully")
-                        yield page
 
-                except Exception as fallback_error:
-                    logger.error("Fallback browser also failed: %s", fallback_error)
-                    raise
-            else:
-                raise
+                    except Exception as fallback_error:
+                        logger.error("Fallback browser also failed: %s", fallback_error)
+                        raise
+
+                # Errors raised by the caller propagate to the provider, never to the fallback
+                yield page
+        finally:
+            _current_provider_type.reset(token)
 
     def get_current_provider_type(self) -> Optional[str]:
-        """Get the type of the currently active provider."""
-        if self._current_provider is None:
-            return None
-        return self._current_provider.__class__.__name__
+        """Get the type of the provider serving the current task's get_page, if any."""
+        provider_type = _current_provider_type.get()
+        return provider_type.value if provider_type is not None else None
 
     async def create_persistent_session(
         self, provider_type: Optional[BrowserProviderType] = None, **kwargs
@@ -127,7 +160,7 @@ class BrowserManager:
             else:
                 provider_type = BrowserProviderType.LOCAL
 
-        provider = self.factory.create_provider(provider_type)
+        provider = self._get_provider(provider_type)
         return await provider.create_session(**kwargs)
 
     async def close_persistent_session(
@@ -140,7 +173,7 @@ class BrowserManager:
             else:
                 provider_type = BrowserProviderType.LOCAL
 
-        provider = self.factory.create_provider(provider_type)
+        provider = self._get_provider(provider_type)
         return await provider.close_session(session_id)
     
     async def get_reusable_session(
@@ -150,17 +183,16 @@ class BrowserManager:
     ) -> Optional[str]:
         """Get a reusable session for the specified provider."""
         try:
-            active_sessions = await self.session_storage.list_active_sessions(provider)
-            if active_sessions:
-                # Return the most recently accessed session
-                most_recent = max(active_sessions, key=lambda s: s['last_accessed'])
-                logger.info(f"Found reusable session {most_recent['session_id']} for provider {provider}")
+            # Ordered server-side where the backend supports it
+            most_recent = await self.session_storage.get_most_recent_session(provider)
+            if most_recent:
+                logger.info("Found reusable session %s for provider %s", most_recent['session_id'], provider)
                 return most_recent['session_id']
             else:
-                logger.info(f"No reusable sessions found for provider {provider}")
+                logger.info("No reusable sessions found for provider %s", provider)
                 return None
         except Exception as e:
-            logger.error(f"Error getting reusable session for provider {provider}: {e}")
+            logger.error("Error getting reusable session for provider %s: %s", provider, e)
             return None
     
     async def store_session_cookies(
@@ -176,9 +208,17 @@ class BrowserManager:
                 session_id, provider, cookies, metadata
             )
         except Exception as e:
-            logger.error(f"Error storing session cookies: {e}")
+            logger.error("Error storing session cookies: %s", e)
             return False
     
+    async def store_sessions_batch(self, records: List[SessionRecord]) -> int:
+        """Store cookies for several sessions in one bulk write, returning how many were stored."""
+        try:
+            return await self.session_storage.batch_store(records)
+        except Exception as e:
+            logger.error("Error batch storing session cookies: %s", e)
+            return 0
+
     def get_browserbase_config(self) -> Dict[str, Any]:
         """Get Browserbase configuration based on debug script patterns."""
         return {
@@ -219,4 +259,4 @@ class BrowserManager:
                     "rotation": "per-session"
                 }
             ] if settings.browserbase_use_residential_proxy else None
-        }
\ No newline at end of file
+        }
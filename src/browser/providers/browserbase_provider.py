@@ -0,0 +1,345 @@
+"""Browserbase browser provider with managed sessions."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Callable, Dict, Optional, Set, Union
+from playwright.async_api import async_playwright, BrowserContext, Page, Playwright
+
+from browserbase import Browserbase
+
+BROWSERBASE_AVAILABLE = True
+
+from src.browser.base import BrowserProvider
+from src.config import settings
+from src.storage import SessionStorage
+from src.storage.factory import get_session_storage
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Official Browserbase CAPTCHA console events from documentation -> (log level, message)
+_CAPTCHA_CONSOLE_EVENTS = {
+    "browserbase-solving-started": (logging.INFO, "🎯 CAPTCHA solving process has begun (browserbase-solving-started)"),
+    "browserbase-solving-finished": (logging.INFO, "✅ CAPTCHA solved successfully! (browserbase-solving-finished)"),
+    "browserbase-solving-failed": (logging.WARNING, "❌ CAPTCHA solving failed (browserbase-solving-failed)"),
+}
+
+
+# Seconds an error screenshot may take; teardown waits no longer than this for it
+_ERROR_SCREENSHOT_TIMEOUT = 2.0
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    """Load a JSON file (run off the event loop)."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def _safe_screenshot(page: Page, path: str) -> None:
+    """Save a debug screenshot, ignoring failures from a page that is going away."""
+    try:
+        # Fail fast instead of Playwright's 30s default on a wedged page
+        await page.screenshot(path=path, timeout=_ERROR_SCREENSHOT_TIMEOUT * 1000)
+        logger.info("📸 Error screenshot saved as %s", path)
+    except Exception as e:
+        logger.debug("Error screenshot %s failed: %s", path, e)
+
+
+class BrowserbaseProvider(BrowserProvider):
+    """Browserbase browser provider with managed sessions."""
+
+    def __init__(self, session_storage: Optional[SessionStorage] = None):
+        if not BROWSERBASE_AVAILABLE:
+            raise ValueError(
+                "Browserbase library not available. Install with: pip install browserbase"
+            )
+
+        if not settings.browserbase_api_key:
+            raise ValueError("BROWSERBASE_API_KEY is required for Browserbase provider")
+
+        self.client = Browserbase(api_key=settings.browserbase_api_key)
+        self.active_sessions: Set[str] = set()  # IDs of sessions opened by this provider
+        
+        # Settings behind every session config, read once instead of per call
+        self._project_id = settings.browserbase_project_id
+        self._captcha_solving_enabled = settings.browserbase_captcha_solving
+        self._use_residential_proxy = settings.browserbase_use_residential_proxy
+        self._connect_timeout = settings.browserbase_connect_timeout
+        self._debug_hold = settings.browserbase_debug_hold
+        self._debug_screenshots = settings.browserbase_debug_screenshots
+        # Add Advanced Stealth Mode if configured (Scale plan only)
+        self._stealth_settings = MappingProxyType(
+            {"advancedStealth": True} if settings.browserbase_stealth_mode == "advanced" else {}
+        )
+        # Browser settings templates keyed by the requested captcha_solving flag
+        self._browser_settings_templates = MappingProxyType({
+            requested: MappingProxyType({
+                # Basic Stealth Mode - automatically enabled by Browserbase
+                "solveCaptchas": requested and self._captcha_solving_enabled,
+                **self._stealth_settings,
+            })
+            for requested in (True, False)
+        })
+        # Use Browserbase's automatic proxy selection when no explicit proxy is given
+        self._default_proxies = True if self._use_residential_proxy else None
+
+        # Reuse the process-wide storage unless one is injected
+        self.session_storage = session_storage or get_session_storage()
+
+        # Blocking SDK calls get their own pool instead of sharing the loop's default executor
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Background session deletes started by get_page, awaited in aclose
+        self._cleanup_tasks: Set[asyncio.Task] = set()
+
+        # Playwright driver shared by every session, started on first use
+        self._playwright: Optional[Playwright] = None
+        self._playwright_lock = asyncio.Lock()
+
+    async def _get_playwright(self) -> Playwright:
+        """Get the shared Playwright driver, starting it on first use."""
+        if self._playwright is None:
+            async with self._playwright_lock:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+        return self._playwright
+
+    def _sdk_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool for blocking Browserbase SDK calls, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="browserbase-sdk")
+        return self._executor
+
+    async def _run_sdk(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Browserbase SDK call on the SDK thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._sdk_executor(), partial(func, *args, **kwargs)
+        )
+
+    async def aclose(self) -> None:
+        """Delete remaining sessions, then stop the shared Playwright driver and the SDK thread pool."""
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+        # Sessions are independent, so the deletes go out concurrently
+        if self.active_sessions:
+            await asyncio.gather(
+                *(self._delete_session(session_id) for session_id in list(self.active_sessions)),
+                return_exceptions=True,
+            )
+        if self._playwright is not None:
+            playwright, self._playwright = self._playwright, None
+            await playwright.stop()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False)
+
+    @asynccontextmanager
+    async def get_page(
+        self,
+        headless: Optional[bool] = None,
+        captcha_solving: bool = True,
+        proxy_config: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> AsyncGenerator[Page, None]:
+        """Get a Browserbase page with automatic cleanup following official documentation."""
+
+        # Build session configuration following official Browserbase patterns
+        browser_settings = dict(self._browser_settings_templates[bool(captcha_solving)])
+        session_config = {"project_id": self._project_id, "browser_settings": browser_settings}
+
+        # Add proxy configuration for better CAPTCHA success rates
+        proxies = [proxy_config] if proxy_config else self._default_proxies
+        if proxies is not None:
+            session_config["proxies"] = proxies
+
+        # Add custom CAPTCHA selectors if provided (following official documentation)
+        image_selector = kwargs.get("captcha_image_selector")
+        if image_selector:
+            browser_settings["captchaImageSelector"] = image_selector
+        input_selector = kwargs.get("captcha_input_selector")
+        if input_selector:
+            browser_settings["captchaInputSelector"] = input_selector
+
+        # Create session
+        logger.info("Creating Browserbase session...")
+        session = await self._run_sdk(self.client.sessions.create, **session_config)
+
+        session_id = session.id
+        connect_url = session.connect_url
+        self.active_sessions.add(session_id)
+
+        logger.info("Browserbase session created: %s", session_id)
+
+        screenshot_task: Optional[asyncio.Task] = None
+        try:
+            # Connect the shared Playwright driver to the Browserbase session
+            playwright = await self._get_playwright()
+            # Bounded so a hung connect falls back quickly; the finally below still
+            # deletes the session that was created
+            browser = await playwright.chromium.connect_over_cdp(
+                connect_url, timeout=self._connect_timeout * 1000
+            )
+
+            try:
+                # Get the default context and page
+                contexts = browser.contexts
+                if contexts:
+                    context = contexts[0]
+                    pages = context.pages
+                    if pages:
+                        page = pages[0]
+                    else:
+                        page = await context.new_page()
+                else:
+                    context = await browser.new_context()
+                    page = await context.new_page()
+
+                # Replay saved login cookies; the session's default context can't take storage_state
+                storage_state = kwargs.get("storage_state")
+                if storage_state:
+                    await self._add_storage_state_cookies(context, storage_state)
+
+                # Set up CAPTCHA event listeners and monitoring
+                await self._setup_captcha_listeners(page)
+
+                logger.info("Connected to Browserbase session successfully")
+                
+                # Keep browser alive during the entire authentication process
+                try:
+                    yield page
+                except Exception as e:
+                    logger.error("Error during page usage: %s", e)
+                    # Screenshot in the background so the re-raise isn't held up
+                    if self._debug_screenshots:
+                        screenshot_task = asyncio.create_task(
+                            _safe_screenshot(page, f"bb_error_{session_id}_{int(time.time())}.png")
+                        )
+                    raise
+                finally:
+                    # Optionally keep browser open for a bit to allow debugging
+                    if self._debug_hold > 0:
+                        logger.info("Keeping browser open for %s seconds for debugging...", self._debug_hold)
+                        await asyncio.sleep(self._debug_hold)
+            finally:
+                # Give a pending error screenshot a moment before the page goes away
+                if screenshot_task is not None:
+                    await asyncio.wait({screenshot_task}, timeout=_ERROR_SCREENSHOT_TIMEOUT)
+                # Disconnect from the session; the driver stays up for the next one
+                try:
+                    await browser.close()
+                except Exception as e:
+                    logger.debug("Failed to disconnect from session %s: %s", session_id, e)
+
+        except Exception as e:
+            logger.error("Browserbase session error: %s", e)
+            raise
+        finally:
+            # Clean up session in the background; the caller doesn't need to wait on it
+            task = asyncio.create_task(self._delete_session(session_id))
+            self._cleanup_tasks.add(task)
+            task.add_done_callback(self._cleanup_tasks.discard)
+
+    async def _delete_session(self, session_id: str) -> None:
+        """Delete a Browserbase session and stop tracking it."""
+        try:
+            await self._run_sdk(self.client.sessions.delete, session_id)
+            logger.info("Browserbase session %s cleaned up", session_id)
+        except Exception as e:
+            logger.warning("Failed to clean up session %s: %s", session_id, e)
+
+        self.active_sessions.discard(session_id)
+
+    @staticmethod
+    async def _add_storage_state_cookies(
+        context: BrowserContext, storage_state: Union[str, Dict[str, Any]]
+    ) -> None:
+        """Add the cookies of a Playwright storage state (path or dict) to context."""
+        try:
+            if isinstance(storage_state, dict):
+                state = storage_state
+            else:
+                state = await asyncio.to_thread(_read_json, storage_state)
+            cookies = state.get("cookies", [])
+            if cookies:
+                await context.add_cookies(cookies)
+                logger.info("🍪 Replayed %d saved cookies into Browserbase session", len(cookies))
+        except Exception as e:
+            logger.warning("Failed to replay saved storage state: %s", e)
+
+    async def _setup_captcha_listeners(self, page: Page) -> None:
+        """Set up event listeners for CAPTCHA solving following official documentation."""
+
+        # Set up console message monitoring for official Browserbase CAPTCHA events
+        def handle_console(msg):
+            message_text = msg.text
+            # Bare event names resolve with a single lookup
+            event = _CAPTCHA_CONSOLE_EVENTS.get(message_text.strip())
+            if event is None:
+                lowered = message_text.lower()
+                # Every event of interest mentions Browserbase, so most page logs stop here
+                if "browserbase" not in lowered:
+                    return
+                event = next(
+                    (event for name, event in _CAPTCHA_CONSOLE_EVENTS.items() if name in lowered), None
+                )
+                if event is None:
+                    if "captcha" in lowered:
+                        logger.info("🔍 Browserbase CAPTCHA event: %s", message_text)
+                    return
+            logger.log(*event)
+        
+        # Set up console event listener
+        page.on("console", handle_console)
+        
+        logger.info("✅ CAPTCHA monitoring setup complete - listening for official Browserbase events")
+
+
+    async def create_session(self, **kwargs) -> str:
+        """Create a new Browserbase session."""
+        session_config = {
+            "project_id": self._project_id,
+            "browser_settings": {
+                "solve_captchas": kwargs.get("captcha_solving", True),
+                "fingerprint": {
+                    "devices": ["desktop"],
+                    "locales": ["en-US"],
+                    "operating_systems": ["linux"],
+                },
+            },
+        }
+
+        # Add proxy configuration if provided
+        if kwargs.get("proxy_config"):
+            session_config["proxies"] = [kwargs["proxy_config"]]
+        elif self._use_residential_proxy:
+            session_config["proxies"] = [
+                {"type": "residential", "geolocation": {"country": "US"}}
+            ]
+
+        # Create session
+        logger.info("Creating persistent Browserbase session...")
+        session = await self._run_sdk(self.client.sessions.create, **session_config)
+
+        session_id = session.id
+        self.active_sessions.add(session_id)
+
+        logger.info("Persistent Browserbase session created: %s", session_id)
+        return session_id
+
+    async def close_session(self, session_id: str) -> bool:
+        """Close a Browserbase session."""
+        # Implementation for session cleanup would go here
+        if session_id in self.active_sessions:
+            try:
+                await self._run_sdk(self.client.sessions.delete, session_id)
+                self.active_sessions.discard(session_id)
+                return True
+            except Exception as e:
+                logger.error("Error closing session %s: %s", session_id, e)
+                return False
+        return False
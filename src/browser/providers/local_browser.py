@@ -1,21 +1,313 @@
 """Local browser provider implementation (refactored from existing BrowserManager)."""
 
 import asyncio
+import itertools
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional, Dict, Any
-from playwright.async_api import Browser, Page, async_playwright
+from types import MappingProxyType
+from typing import AsyncGenerator, Optional, Dict, Any, Tuple
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route, async_playwright
 from ..base import BrowserProvider
 from ...config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Basic CAPTCHA detection, installed before page scripts run. Neither body nor the
+# document element exists yet at that point, so the observer watches the document
+# itself; the IIFE keeps its bindings out of the page's global scope
+_CAPTCHA_DETECTION_JS = """
+(() => {
+    window.localCaptchaEvents = {
+        detected: false,
+        solving: false,
+        solved: false,
+        failed: false
+    };
+
+    const observer = new MutationObserver((mutations) => {
+        mutations.forEach((mutation) => {
+            if (mutation.type === 'childList') {
+                // Check for CAPTCHA elements
+                const captchaElements = document.querySelectorAll(
+                    'iframe[src*="recaptcha"], .g-recaptcha, .h-captcha, [data-sitekey]'
+                );
+                if (captchaElements.length > 0) {
+                    window.localCaptchaEvents.detected = true;
+                    console.log('🔍 CAPTCHA detected by local browser');
+                }
+            }
+        });
+    });
+
+    observer.observe(document, {
+        childList: true,
+        subtree: true
+    });
+})();
+"""
+
+# Ubuntu-optimized Chromium args; the browser is shared by many contexts, so it
+# keeps the multi-process model (no --single-process)
+_CHROMIUM_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-web-security",
+    "--disable-extensions",
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    # Chromium honours only the last --disable-features, so keep them in one flag
+    "--disable-features=TranslateUI,VizDisplayCompositor",
+    "--disable-ipc-flooding-protection",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-logging",
+    "--disable-gpu-logging",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-background-networking",
+    "--disable-client-side-phishing-detection",
+    "--disable-hang-monitor",
+    "--disable-prompt-on-repost",
+    "--metrics-recording-only",
+    "--no-default-browser-check",
+    "--safebrowsing-disable-auto-update",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-component-extensions-with-background-pages",
+    "--force-color-profile=srgb",
+    "--memory-pressure-off",
+    "--js-flags=--max-old-space-size=4096",
+    "--disable-setuid-sandbox",
+    "--disable-accelerated-2d-canvas",
+    "--disable-accelerated-jpeg-decoding",
+    "--disable-accelerated-mjpeg-decode",
+    "--disable-accelerated-video-decode",
+    "--disable-gpu-compositing",
+    "--disable-gpu-rasterization",
+    "--disable-gpu-sandbox",
+)
+
+_VIEWPORT = {"width": 1280, "height": 720}
+
+# Simplified stealth script - no duplicate definitions
+_STEALTH_INIT_SCRIPT = """
+// Remove webdriver property
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined,
+});
+
+// Mock plugins only once
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [
+        {
+            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
+            description: "Portable Document Format",
+            filename: "internal-pdf-viewer",
+            length: 1,
+            name: "Chrome PDF Plugin"
+        }
+    ],
+});
+
+// Mock languages
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['en-US', 'en'],
+});
+
+// Mock chrome object
+window.chrome = {
+    runtime: {},
+    loadTimes: function() {},
+    csi: function() {},
+    app: {}
+};
+
+// Mock platform
+Object.defineProperty(navigator, 'platform', {
+    get: () => 'Linux x86_64',
+});
+
+// Mock hardware concurrency
+Object.defineProperty(navigator, 'hardwareConcurrency', {
+    get: () => 4,
+});
+
+// Mock device memory
+Object.defineProperty(navigator, 'deviceMemory', {
+    get: () => 8,
+});
+
+// Remove automation indicators
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Array;
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Promise;
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Symbol;
+"""
+
+# Browser-like request headers sent by Chromium contexts
+_EXTRA_HTTP_HEADERS = MappingProxyType({
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="131", "Google Chrome";v="131"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"Linux"',
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Upgrade-Insecure-Requests": "1",
+})
+
+# More compatible user agent for Slack
+_CHROME_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+_FIREFOX_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0"
+
+# Resource types an auth flow can do without
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    """Abort requests for non-essential resources, let everything else through."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class LocalBrowserProvider(BrowserProvider):
     """Local browser provider using Playwright directly."""
 
     def __init__(self):
-        self.active_sessions: Dict[str, Browser] = {}
+        self.active_sessions: Dict[str, BrowserContext] = {}
+        self._session_counter = itertools.count(1)
+
+        # Playwright driver and launched browsers shared by every get_page, started on
+        # first use; only the context is created per page
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[Tuple[str, bool], Browser] = {}
+        self._remote_browser: Optional[Browser] = None
+        self._init_lock = asyncio.Lock()
+        self._context_slots = asyncio.Semaphore(settings.browser_max_contexts)
+
+    async def _get_playwright(self) -> Playwright:
+        """Get the shared Playwright driver, starting it on first use."""
+        if self._playwright is None:
+            async with self._init_lock:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _ensure_browser(self, browser_type: str, headless: bool) -> Browser:
+        """Get the launched browser for (browser_type, headless), launching it on first use."""
+        key = (browser_type, headless)
+        browser = self._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        playwright = await self._get_playwright()
+        async with self._init_lock:
+            browser = self._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                logger.info("Launching %s browser (headless=%s)", browser_type, headless)
+                if browser_type == "firefox":
+                    browser = await playwright.firefox.launch(headless=headless)
+                else:
+                    browser = await playwright.chromium.launch(
+                        headless=headless, args=_CHROMIUM_ARGS
+                    )
+                self._browsers[key] = browser
+        return browser
+
+    async def _get_remote_browser(self) -> Browser:
+        """Get the shared CDP connection to BROWSER_WS_ENDPOINT, reconnecting if it dropped."""
+        browser = self._remote_browser
+        if browser is not None and browser.is_connected():
+            return browser
+
+        playwright = await self._get_playwright()
+        async with self._init_lock:
+            if self._remote_browser is None or not self._remote_browser.is_connected():
+                logger.info(
+                    "Connecting to remote browser: %s", settings.browser_ws_endpoint
+                )
+                self._remote_browser = await playwright.chromium.connect_over_cdp(
+                    settings.browser_ws_endpoint
+                )
+        return self._remote_browser
+
+    async def aclose(self) -> None:
+        """Close the launched browsers and remote connection, then stop the shared Playwright driver."""
+        # Persistent session contexts close with their browsers
+        self.active_sessions.clear()
+        browsers, self._browsers = list(self._browsers.values()), {}
+        if self._remote_browser is not None:
+            browsers.append(self._remote_browser)
+            self._remote_browser = None
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug("Failed to close browser: %s", e)
+        if self._playwright is not None:
+            playwright, self._playwright = self._playwright, None
+            await playwright.stop()
+
+    async def _new_context(
+        self, browser_type: str, headless: bool, storage_state: Optional[Any] = None
+    ) -> BrowserContext:
+        """Open a context with the stealth setup on the shared browser.
+
+        If the browser dies between the liveness check and new_context, it is
+        relaunched (or reconnected) and the context is retried once.
+        """
+        # Use Firefox for better compatibility with some sites; remote endpoints are Chromium
+        firefox = browser_type == "firefox" and not settings.browser_ws_endpoint
+        for attempt in range(2):
+            # Check if we should use a remote endpoint
+            if settings.browser_ws_endpoint:
+                browser = await self._get_remote_browser()
+            else:
+                browser = await self._ensure_browser("firefox" if firefox else "chromium", headless)
+
+            try:
+                context = await browser.new_context(
+                    viewport=_VIEWPORT,
+                    storage_state=storage_state,
+                    user_agent=_FIREFOX_USER_AGENT if firefox else _CHROME_USER_AGENT,
+                    java_script_enabled=True,
+                    accept_downloads=False,
+                    ignore_https_errors=True,
+                    extra_http_headers=None if firefox else _EXTRA_HTTP_HEADERS,
+                )
+                break
+            except Exception:
+                # Only a browser that went away is worth another try
+                if attempt or browser.is_connected():
+                    raise
+                logger.warning("Browser disconnected while opening a context, replacing it")
+
+        try:
+            await context.add_init_script(_STEALTH_INIT_SCRIPT)
+            if settings.block_heavy_resources:
+                await context.route("**/*", _block_heavy_resources)
+        except Exception:
+            # Don't leave a half-configured context open on the shared browser
+            await context.close()
+            raise
+        return context
 
     @asynccontextmanager
     async def get_page(
@@ -30,218 +322,48 @@ class LocalBrowserProvider(BrowserProvider):
         if headless is None:
             headless = settings.headless
 
-        # Ubuntu-optimized Chromium args
-        browser_args = [
-            "--disable-blink-features=AutomationControlled",
-            "--no-sandbox",
-            "--disable-web-security",
-            "--disable-infobars",
-            "--disable-extensions",
-            "--start-maximized",
-            "--window-size=1280,720",
-            "--disable-dev-shm-usage",
-            "--disable-background-timer-throttling",
-            "--disable-backgrounding-occluded-windows",
-            "--disable-renderer-backgrounding",
-            "--disable-features=TranslateUI",
-            "--disable-ipc-flooding-protection",
-            "--disable-default-apps",
-            "--disable-sync",
-            "--disable-translate",
-            "--hide-scrollbars",
-            "--mute-audio",
-            "--no-first-run",
-            "--disable-logging",
-            "--disable-gpu-logging",
-            "--disable-gpu",
-            "--disable-software-rasterizer",
-            "--disable-background-networking",
-            "--disable-client-side-phishing-detection",
-            "--disable-hang-monitor",
-            "--disable-prompt-on-repost",
-            "--metrics-recording-only",
-            "--no-default-browser-check",
-            "--safebrowsing-disable-auto-update",
-            "--password-store=basic",
-            "--use-mock-keychain",
-            "--disable-component-extensions-with-background-pages",
-            "--force-color-profile=srgb",
-            "--memory-pressure-off",
-            "--max_old_space_size=4096",
-            "--disable-setuid-sandbox",
-            "--disable-accelerated-2d-canvas",
-            "--disable-accelerated-jpeg-decoding",
-            "--disable-accelerated-mjpeg-decode",
-            "--disable-accelerated-video-decode",
-            "--disable-gpu-compositing",
-            "--disable-gpu-rasterization",
-            "--disable-gpu-sandbox",
-            "--single-process",
-        ]
-
-        # More compatible user agent for Slack
-        user_agent = (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/131.0.0.0 Safari/537.36"
-        )
+        # Saved cookies/localStorage to replay into the new context
+        storage_state = kwargs.get("storage_state")
 
-        async with async_playwright() as p:
-            # Check if we should use a remote endpoint
-            if settings.browser_ws_endpoint:
-                logger.info(
-                    f"Connecting to remote browser: {settings.browser_ws_endpoint}"
-                )
-                browser = await p.chromium.connect_over_cdp(
-                    settings.browser_ws_endpoint
-                )
-                context = await browser.new_context(
-                    viewport={"width": 1280, "height": 720},
-                    user_agent=user_agent,
-                    java_script_enabled=True,
-                    accept_downloads=False,
-                    ignore_https_errors=True,
-                    extra_http_headers={
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                        "Accept-Language": "en-US,en;q=0.9",
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "Cache-Control": "no-cache",
-                        "Pragma": "no-cache",
-                        "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="131", "Google Chrome";v="131"',
-                        "Sec-Ch-Ua-Mobile": "?0",
-                        "Sec-Ch-Ua-Platform": '"Linux"',
-                        "Sec-Fetch-Dest": "document",
-                        "Sec-Fetch-Mode": "navigate",
-                        "Sec-Fetch-Site": "none",
-                        "Sec-Fetch-User": "?1",
-                        "Upgrade-Insecure-Requests": "1",
-                    },
-                )
-            else:
-                # Launch local browser
-                if browser_type == "firefox":
-                    # Use Firefox for better compatibility with some sites
-                    browser = await p.firefox.launch(headless=headless)
-                    context = await browser.new_context(
-                        viewport={"width": 1280, "height": 720},
-                        user_agent="Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0",
-                        java_script_enabled=True,
-                        accept_downloads=False,
-                        ignore_https_errors=True,
-                    )
-                else:
-                    browser = await p.chromium.launch(
-                        headless=headless, args=browser_args
-                    )
-                    context = await browser.new_context(
-                        viewport={"width": 1280, "height": 720},
-                        user_agent=user_agent,
-                        java_script_enabled=True,
-                        accept_downloads=False,
-                        ignore_https_errors=True,
-                        extra_http_headers={
-                            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                            "Accept-Language": "en-US,en;q=0.9",
-                            "Accept-Encoding": "gzip, deflate, br",
-                            "Cache-Control": "no-cache",
-                            "Pragma": "no-cache",
-                            "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="131", "Google Chrome";v="131"',
-                            "Sec-Ch-Ua-Mobile": "?0",
-                            "Sec-Ch-Ua-Platform": '"Linux"',
-                            "Sec-Fetch-Dest": "document",
-                            "Sec-Fetch-Mode": "navigate",
-                            "Sec-Fetch-Site": "none",
-                            "Sec-Fetch-User": "?1",
-                            "Upgrade-Insecure-Requests": "1",
-                        },
-                    )
+        # Bound the contexts open on the shared browsers; extra callers wait for a slot
+        async with self._context_slots:
+            context = await self._new_context(browser_type, headless, storage_state)
+            try:
+                page = await context.new_page()
 
-            # Simplified stealth script - no duplicate definitions
-            await context.add_init_script(
-                """
-                // Remove webdriver property
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined,
-                });
-                
-                // Mock plugins only once
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        {
-                            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "internal-pdf-viewer",
-                            length: 1,
-                            name: "Chrome PDF Plugin"
-                        }
-                    ],
-                });
-                
-                // Mock languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en'],
-                });
-                
-                // Mock chrome object
-                window.chrome = {
-                    runtime: {},
-                    loadTimes: function() {},
-                    csi: function() {},
-                    app: {}
-                };
-                
-                // Mock platform
-                Object.defineProperty(navigator, 'platform', {
-                    get: () => 'Linux x86_64',
-                });
-                
-                // Mock hardware concurrency
-                Object.defineProperty(navigator, 'hardwareConcurrency', {
-                    get: () => 4,
-                });
-                
-                // Mock device memory
-                Object.defineProperty(navigator, 'deviceMemory', {
-                    get: () => 8,
-                });
-                
-                // Remove automation indicators
-                delete window.cdc_adoQpoasnfa76pfcZLmcfl_Array;
-                delete window.cdc_adoQpoasnfa76pfcZLmcfl_Promise;
-                delete window.cdc_adoQpoasnfa76pfcZLmcfl_Symbol;
-            """
-            )
-
-            page = await context.new_page()
-
-            # Set up CAPTCHA solving if enabled
-            if captcha_solving:
-                await self._setup_captcha_solving(page)
+                # Set up CAPTCHA solving if enabled
+                if captcha_solving:
+                    await self._setup_captcha_solving(page)
 
-            try:
                 yield page
             finally:
+                # Browsers and the remote connection stay up for the next page
                 await context.close()
-                # Only close when locally launched
-                if not settings.browser_ws_endpoint:
-                    await browser.close()
 
     async def create_session(self, **kwargs) -> str:
-        """Create a new local browser session."""
-        # For local browsers, sessions are typically short-lived
-        # This could be extended for persistent session management
-        pass
+        """Create a persistent context on the shared local browser."""
+        headless = kwargs.get("headless")
+        if headless is None:
+            headless = settings.headless
+
+        context = await self._new_context(
+            kwargs.get("browser_type", "chromium"), headless, kwargs.get("storage_state")
+        )
+        # Counter IDs are never reused, unlike id() of a collected object
+        session_id = f"local-{next(self._session_counter)}"
+        self.active_sessions[session_id] = context
+        return session_id
 
     async def close_session(self, session_id: str) -> bool:
         """Close a local browser session."""
         if session_id in self.active_sessions:
             try:
-                browser = self.active_sessions[session_id]
-                await browser.close()
+                context = self.active_sessions[session_id]
+                await context.close()
                 del self.active_sessions[session_id]
                 return True
             except Exception as e:
-                logger.error(f"Error closing session {session_id}: {e}")
+                logger.error("Error closing session %s: %s", session_id, e)
                 return False
         return False
 
@@ -250,37 +372,9 @@ class LocalBrowserProvider(BrowserProvider):
         try:
             logger.info("🔧 Setting up CAPTCHA solving for local browser")
             
-            # Set up basic CAPTCHA detection
-            await page.evaluate("""
-                window.localCaptchaEvents = {
-                    detected: false,
-                    solving: false,
-                    solved: false,
-                    failed: false
-                };
-                
-                // Basic CAPTCHA detection
-                const observer = new MutationObserver((mutations) => {
-                    mutations.forEach((mutation) => {
-                        if (mutation.type === 'childList') {
-                            // Check for CAPTCHA elements
-                            const captchaElements = document.querySelectorAll(
-                                'iframe[src*="recaptcha"], .g-recaptcha, .h-captcha, [data-sitekey]'
-                            );
-                            if (captchaElements.length > 0) {
-                                window.localCaptchaEvents.detected = true;
-                                console.log('🔍 CAPTCHA detected by local browser');
-                            }
-                        }
-                    });
-                });
-                
-                observer.observe(document.body, {
-                    childList: true,
-                    subtree: true
-                });
-            """)
+            # Registered as an init script so it runs in every new document of the page
+            await page.add_init_script(_CAPTCHA_DETECTION_JS)
             
             logger.info("✅ CAPTCHA solving setup complete for local browser")
         except Exception as e:
-            logger.error(f"❌ Failed to setup CAPTCHA solving: {e}")
+            logger.error("❌ Failed to setup CAPTCHA solving: %s", e)
@@ -9,6 +9,10 @@ class Settings:
     # Browser settings
     headless: bool = os.environ.get("HEADLESS", "true").lower() == "true"
     browser_type: Literal["chromium", "firefox", "webkit"] = os.environ.get("BROWSER_TYPE", "chromium")
+    # Max browser contexts open at once on the shared local browser
+    browser_max_contexts: int = int(os.environ.get("BROWSER_MAX_CONTEXTS", "8"))
+    # Abort image/media/font/stylesheet requests in local contexts (image CAPTCHAs need images)
+    block_heavy_resources: bool = os.environ.get("BLOCK_HEAVY_RESOURCES", "false").lower() == "true"
 
     # API settings
     api_host: str = os.environ.get("API_HOST", "0.0.0.0")
@@ -37,6 +41,12 @@ class Settings:
     browserbase_captcha_retry_attempts: int = int(os.environ.get("BROWSERBASE_CAPTCHA_RETRY_ATTEMPTS", "3"))
     browserbase_captcha_provider: str = os.environ.get("BROWSERBASE_CAPTCHA_PROVIDER", "browserbase")
     browserbase_auto_solve_captcha: bool = os.environ.get("BROWSERBASE_AUTO_SOLVE_CAPTCHA", "true").lower() == "true"
+    # Seconds to wait for the CDP connection to a new Browserbase session before falling back to the local browser
+    browserbase_connect_timeout: float = float(os.environ.get("BROWSERBASE_CONNECT_TIMEOUT", "30"))
+    # Seconds to keep a Browserbase session open after use for debugging (0 = close immediately)
+    browserbase_debug_hold: float = float(os.environ.get("BROWSERBASE_DEBUG_HOLD", "0"))
+    # Save a per-session screenshot when a Browserbase page errors out
+    browserbase_debug_screenshots: bool = os.environ.get("BROWSERBASE_DEBUG_SCREENSHOTS", "false").lower() == "true"
 
     # CAPTCHA solver preferences
     captcha_solver_preferences: list[str] = os.environ.get("CAPTCHA_SOLVER_PREFERENCES", "browserbase,manual").split(",")
@@ -49,6 +59,9 @@ class Settings:
     # Session management
     session_reuse_enabled: bool = os.environ.get("SESSION_REUSE_ENABLED", "true").lower() == "true"
     session_timeout_minutes: int = int(os.environ.get("SESSION_TIMEOUT_MINUTES", "60"))
+    storage_state_dir: str = os.environ.get("STORAGE_STATE_DIR", ".cache")
+    # Replay saved Slack browser state on repeat logins (off by default; the state holds live cookies)
+    slack_storage_state_reuse: bool = os.environ.get("SLACK_STORAGE_STATE_REUSE", "false").lower() == "true"
 
     # Provider-specific configurations
     slack_workspace_url: str = os.environ.get("SLACK_WORKSPACE_URL", "")
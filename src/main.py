@@ -33,6 +33,12 @@ auth_factory = AuthStrategyFactory()
 storage = MockStorage()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release browser resources held across requests."""
+    await browser_manager.aclose()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -67,6 +73,8 @@ async def login(request: LoginRequest):
             # Pass Browserbase-specific configuration
             captcha_image_selector=request.captcha_image_selector,
             captcha_input_selector=request.captcha_input_selector,
+            # Replay a saved login when the strategy has one
+            storage_state=auth_strategy.get_storage_state_path(request),
         ) as page:
             success, cookies, message, oauth_tokens = await auth_strategy.authenticate(page, request)
 
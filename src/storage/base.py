@@ -1,10 +1,13 @@
 """Base storage interface for session management."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from src.models import SessionCookie
 
+# (session_id, provider, cookies, metadata) as passed to store_session
+SessionRecord = Tuple[str, str, List[SessionCookie], Optional[Dict[str, Any]]]
+
 
 class SessionStorage(ABC):
     """Abstract base class for session storage implementations."""
@@ -51,3 +54,25 @@ class SessionStorage(ABC):
     ) -> bool:
         """Check if session is still valid."""
         pass
+
+    async def get_most_recent_session(self, provider: str) -> Optional[Dict[str, Any]]:
+        """Get the most recently accessed active session for provider.
+
+        Backends that can order by last access server-side override this; the
+        default picks the newest of list_active_sessions.
+        """
+        active_sessions = await self.list_active_sessions(provider)
+        if not active_sessions:
+            return None
+        return max(active_sessions, key=lambda s: s['last_accessed'])
+
+    async def batch_store(self, records: List[SessionRecord]) -> int:
+        """Store several sessions, returning how many were stored.
+
+        Backends with a bulk write API override this; the default stores them one by one.
+        """
+        stored = 0
+        for session_id, provider, cookies, metadata in records:
+            if await self.store_session(session_id, provider, cookies, metadata):
+                stored += 1
+        return stored
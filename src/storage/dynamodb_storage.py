@@ -1,18 +1,32 @@
 """DynamoDB storage implementation for session management."""
 
+import asyncio
 import json
 import logging
+import zlib
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import boto3
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
-from .base import SessionStorage
+from .base import SessionRecord, SessionStorage
 from src.models import SessionCookie
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Serialized cookie lists at least this large are stored zlib-compressed in a
+# single binary attribute; smaller ones stay a plain list
+_COMPRESS_COOKIES_MIN_BYTES = 512
+
+# Global secondary indexes the table is expected to have:
+#   provider-index              partition key 'provider'
+#   provider-lastAccessed-index partition key 'provider', sort key 'last_accessed'
+# Without the second one, get_most_recent_session falls back to the provider-index listing.
+_PROVIDER_INDEX = 'provider-index'
+_RECENT_SESSION_INDEX = 'provider-lastAccessed-index'
+
 
 class DynamoDBSessionStorage(SessionStorage):
     """DynamoDB implementation of session storage."""
@@ -34,6 +48,8 @@ class DynamoDBSessionStorage(SessionStorage):
             self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
         
         self.table = self.dynamodb.Table(self.table_name)
+        # Cleared when the table turns out to lack the last-accessed index
+        self._recent_index_available = True
 
     async def store_session(
         self, 
@@ -44,68 +60,119 @@ class DynamoDBSessionStorage(SessionStorage):
     ) -> bool:
         """Store session data in DynamoDB."""
         try:
-            # Convert cookies to serializable format
-            cookies_data = []
-            for cookie in cookies:
-                cookies_data.append({
-                    'name': cookie.name,
-                    'value': cookie.value,
-                    'domain': cookie.domain,
-                    'path': cookie.path,
-                    'secure': cookie.secure,
-                    'http_only': cookie.http_only
-                })
-
-            # Calculate TTL (Time To Live) for DynamoDB
-            ttl = int((datetime.utcnow() + timedelta(minutes=settings.session_timeout_minutes)).timestamp())
-
-            item = {
-                'session_id': session_id,
-                'provider': provider,
-                'cookies': cookies_data,
-                'metadata': metadata or {},
-                'created_at': datetime.utcnow().isoformat(),
-                'last_accessed': datetime.utcnow().isoformat(),
-                'ttl': ttl
-            }
-
-            self.table.put_item(Item=item)
-            logger.info(f"Session {session_id} stored successfully in DynamoDB")
+            item = self._build_item(session_id, provider, cookies, metadata)
+            await asyncio.to_thread(self.table.put_item, Item=item)
+            logger.info("Session %s stored successfully in DynamoDB", session_id)
             return True
 
         except ClientError as e:
-            logger.error(f"Failed to store session {session_id} in DynamoDB: {e}")
+            logger.error("Failed to store session %s in DynamoDB: %s", session_id, e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error storing session {session_id}: {e}")
+            logger.error("Unexpected error storing session %s: %s", session_id, e)
             return False
 
+    async def batch_store(self, records: List[SessionRecord]) -> int:
+        """Store sessions with BatchWriteItem (25 items per request, unprocessed items retried)."""
+        if not records:
+            return 0
+
+        items = [self._build_item(*record) for record in records]
+
+        def write_batch() -> None:
+            with self.table.batch_writer(overwrite_by_pkeys=['session_id']) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+
+        try:
+            await asyncio.to_thread(write_batch)
+            logger.info("Stored %d sessions in DynamoDB with batch writes", len(items))
+            return len(items)
+
+        except ClientError as e:
+            logger.error("Failed to batch store %d sessions in DynamoDB: %s", len(items), e)
+            return 0
+        except Exception as e:
+            logger.error("Unexpected error batch storing %d sessions: %s", len(items), e)
+            return 0
+
+    @staticmethod
+    def _build_item(
+        session_id: str,
+        provider: str,
+        cookies: List[SessionCookie],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the DynamoDB item for a session."""
+        # Convert cookies to serializable format
+        cookies_data = []
+        for cookie in cookies:
+            cookies_data.append({
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'secure': cookie.secure,
+                'http_only': cookie.http_only
+            })
+
+        now = datetime.utcnow()
+        # Calculate TTL (Time To Live) for DynamoDB
+        ttl = int((now + timedelta(minutes=settings.session_timeout_minutes)).timestamp())
+
+        item = {
+            'session_id': session_id,
+            'provider': provider,
+            'metadata': metadata or {},
+            'created_at': now.isoformat(),
+            'last_accessed': now.isoformat(),
+            'ttl': ttl
+        }
+
+        # Writes are billed per KB, so large cookie jars go in as one compressed blob
+        encoded = json.dumps(cookies_data, separators=(',', ':')).encode('utf-8')
+        if len(encoded) >= _COMPRESS_COOKIES_MIN_BYTES:
+            item['cookies_z'] = zlib.compress(encoded, 6)
+        else:
+            item['cookies'] = cookies_data
+        return item
+
+    @staticmethod
+    def _decode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Return item with a compressed cookie blob expanded back into 'cookies'."""
+        blob = item.get('cookies_z')
+        if blob is None:
+            return item
+        decoded = {key: value for key, value in item.items() if key != 'cookies_z'}
+        decoded['cookies'] = json.loads(zlib.decompress(getattr(blob, 'value', blob)))
+        return decoded
+
     async def get_session(
         self, 
         session_id: str
     ) -> Optional[Dict[str, Any]]:
         """Retrieve session data from DynamoDB."""
         try:
-            response = self.table.get_item(Key={'session_id': session_id})
+            response = await asyncio.to_thread(self.table.get_item, Key={'session_id': session_id})
             
             if 'Item' not in response:
-                logger.info(f"Session {session_id} not found in DynamoDB")
+                logger.info("Session %s not found in DynamoDB", session_id)
                 return None
 
             item = response['Item']
             
             # Update last accessed time
             item['last_accessed'] = datetime.utcnow().isoformat()
-            self.table.put_item(Item=item)
+            await asyncio.to_thread(self.table.put_item, Item=item)
             
-            logger.info(f"Session {session_id} retrieved successfully from DynamoDB")
-            return item
+            logger.info("Session %s retrieved successfully from DynamoDB", session_id)
+            return self._decode_item(item)
 
         except ClientError as e:
-            logger.error(f"Failed to retrieve session {session_id} from DynamoDB: {e}")
+            logger.error("Failed to retrieve session %s from DynamoDB: %s", session_id, e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error retrieving session {session_id}: {e}")
+            logger.error("Unexpected error retrieving session %s: %s", session_id, e)
             return None
 
     async def list_active_sessions(
@@ -116,14 +183,15 @@ class DynamoDBSessionStorage(SessionStorage):
         try:
             if provider:
                 # Query by provider using GSI (Global Secondary Index)
-                response = self.table.query(
-                    IndexName='provider-index',  # Assumes GSI exists
+                response = await asyncio.to_thread(
+                    self.table.query,
+                    IndexName=_PROVIDER_INDEX,  # Assumes GSI exists
                     KeyConditionExpression='provider = :provider',
                     ExpressionAttributeValues={':provider': provider}
                 )
             else:
                 # Scan all items (expensive operation)
-                response = self.table.scan()
+                response = await asyncio.to_thread(self.table.scan)
 
             sessions = response.get('Items', [])
             
@@ -135,36 +203,76 @@ class DynamoDBSessionStorage(SessionStorage):
                 try:
                     last_accessed = datetime.fromisoformat(session['last_accessed'])
                     if current_time - last_accessed < timedelta(minutes=settings.session_timeout_minutes):
-                        active_sessions.append(session)
+                        active_sessions.append(self._decode_item(session))
                 except (KeyError, ValueError):
                     # Skip sessions with invalid timestamps
                     continue
 
-            logger.info(f"Found {len(active_sessions)} active sessions")
+            logger.info("Found %d active sessions", len(active_sessions))
             return active_sessions
 
         except ClientError as e:
-            logger.error(f"Failed to list sessions from DynamoDB: {e}")
+            logger.error("Failed to list sessions from DynamoDB: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Unexpected error listing sessions: {e}")
+            logger.error("Unexpected error listing sessions: %s", e)
             return []
 
+    async def get_most_recent_session(self, provider: str) -> Optional[Dict[str, Any]]:
+        """Get the newest session for provider with a single descending GSI query."""
+        if not self._recent_index_available:
+            return await super().get_most_recent_session(provider)
+
+        try:
+            # ISO timestamps sort lexicographically, so the index returns newest first
+            response = await asyncio.to_thread(
+                self.table.query,
+                IndexName=_RECENT_SESSION_INDEX,
+                KeyConditionExpression=Key('provider').eq(provider),
+                ScanIndexForward=False,
+                Limit=1
+            )
+            items = response.get('Items', [])
+            if not items:
+                return None
+
+            # If the newest session has expired, every older one has too
+            session = items[0]
+            last_accessed = datetime.fromisoformat(session['last_accessed'])
+            if datetime.utcnow() - last_accessed >= timedelta(minutes=settings.session_timeout_minutes):
+                return None
+            return self._decode_item(session)
+
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ValidationException':
+                # Index missing on this table; use the provider-index listing from now on
+                logger.warning(
+                    "GSI %s unavailable (%s), falling back to listing active sessions",
+                    _RECENT_SESSION_INDEX, e
+                )
+                self._recent_index_available = False
+                return await super().get_most_recent_session(provider)
+            logger.error("Failed to query most recent session for provider %s: %s", provider, e)
+            return None
+        except Exception as e:
+            logger.error("Unexpected error querying most recent session for provider %s: %s", provider, e)
+            return None
+
     async def delete_session(
         self, 
         session_id: str
     ) -> bool:
         """Delete session data from DynamoDB."""
         try:
-            self.table.delete_item(Key={'session_id': session_id})
-            logger.info(f"Session {session_id} deleted successfully from DynamoDB")
+            await asyncio.to_thread(self.table.delete_item, Key={'session_id': session_id})
+            logger.info("Session %s deleted successfully from DynamoDB", session_id)
             return True
 
         except ClientError as e:
-            logger.error(f"Failed to delete session {session_id} from DynamoDB: {e}")
+            logger.error("Failed to delete session %s from DynamoDB: %s", session_id, e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error deleting session {session_id}: {e}")
+            logger.error("Unexpected error deleting session %s: %s", session_id, e)
             return False
 
     async def is_session_valid(
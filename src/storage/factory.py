@@ -1,7 +1,7 @@
 """Storage factory for creating storage instances based on environment."""
 
 import logging
-from typing import Union
+from typing import Optional, Union
 from enum import Enum
 
 from .base import SessionStorage
@@ -102,3 +102,22 @@ class StorageFactory:
         else:
             logger.error(f"Unknown storage type: {storage_type}")
             return False
+
+
+# Process-wide storage instance, shared so only one DynamoDB resource is built
+_session_storage: Optional[SessionStorage] = None
+
+
+def get_session_storage() -> SessionStorage:
+    """Get the shared session storage for the configured storage type, creating it on first use.
+
+    Unknown storage types fall back to mock storage instead of raising.
+    """
+    global _session_storage
+    if _session_storage is None:
+        if settings.storage_type.lower() in StorageFactory.get_available_storage_types():
+            _session_storage = StorageFactory.create_storage()
+        else:
+            logger.warning("Unknown storage type %r, using MockSessionStorage", settings.storage_type)
+            _session_storage = MockSessionStorage()
+    return _session_storage